@@ -3,10 +3,23 @@
 
 import re
 import time
+import functools
+import itertools
+import queue
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from typing import List, Dict, Optional, Tuple
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from email.utils import parsedate_to_datetime
+import httpx
+import lxml.html
+from lxml import etree
+from lxml.html import HtmlElement
+import xlsxwriter
+from html import unescape
 from urllib.parse import urljoin, urlparse, parse_qs
 
 # ---------- SITE CONSTANTS ----------
@@ -16,36 +29,216 @@ OUT_XLSX = "example.xlsx"
 
 TIMEOUT = 20
 RETRIES = 3
-SLEEP_BETWEEN_SERIES = 0.2
-SLEEP_BETWEEN_PRODUCTS = 0.1
-ITEM_LIMIT = 99999  # increase or set to None for full crawl
+MAX_HOLD_OFF = 60   # cap (s) on how long a Retry-After/X-RateLimit-Reset may pause a host
+ITEM_LIMIT = 99999  # rows to collect; increase or set to None for full crawl
+MAX_WORKERS = 16    # series/product pages parsed concurrently
+IN_FLIGHT = MAX_WORKERS * 4  # product pages submitted ahead of the row being written
+MAX_PER_HOST = 8    # concurrent GETs against one host (politeness cap)
+SELENIUM_DRIVERS = 4  # headless drivers shared by the Selenium fallback
+BS4_MISS_THRESHOLD = 3  # BS4 misses (and no hits) before a series goes Selenium-only
+
+# ---------- COMPILED XPATHS ----------
+def _cls(name: str) -> str:
+    """XPath test for one CSS class token (same as `.name` in a selector)."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+_XP_TEX = etree.XPath(
+    f"((.//section[{_cls('ExampleSection')}])[1]//div[{_cls('ExampleContainer')}])[1]"
+    f"//*[self::img[{_cls('picture__image')}] or self::source[@srcset]]"
+)
+_XP_PRODUCT_NAME = etree.XPath(f"(.//*[{_cls('exampleProductItemContent')}])[1]")
+_XP_H1_TITLE = etree.XPath(f"(.//h1//*[{_cls('title__content')}])[1]")
+_XP_DETAILS = etree.XPath(f"(.//*[{_cls('exampleProductDetails')}])[1]")
+_XP_DETAILS_ITEM = etree.XPath(f".//*[{_cls('exampleProductDetailsItem')}]")
+_XP_ITEM_TITLE = etree.XPath(f"(.//h4//*[{_cls('title__content')}])[1]")
+_XP_LIST_LI = etree.XPath(f".//*[{_cls('details__item__list')}]//li")
+_XP_PARAS = etree.XPath(f".//*[{_cls('paragraph')}] | .//p")
+_XP_SERIES_LINK = etree.XPath(f".//a[{_cls('exampleSelectProductListItem')}]")
+_XP_SERIES_TITLE = etree.XPath(f"(.//*[{_cls('ItemTitle')}])[1]")
+_XP_PRODUCT_LINK = etree.XPath(f".//a[{_cls('ProductItem')}]")
+_XP_PRODUCT_TITLE = etree.XPath(f"(.//*[{_cls('ProductItemContent')}])[1]")
+
+def _first(xp: etree.XPath, node: HtmlElement) -> Optional[HtmlElement]:
+    found = xp(node)
+    return found[0] if found else None
+
+# ---------- LISTING REGEXES ----------
+# listing pages only need <a> href + title text, so try plain regexes before
+# building a DOM; the class test matches a whole token, like `.name` in CSS,
+# and attribute values may be double-, single- or unquoted
+def _class_test(cls: str) -> str:
+    return r"""(?<![\w-])class\s*=\s*(?:"[^"]*|'[^']*)?(?<![\w-])""" + re.escape(cls) + r"""(?![\w-])"""
+
+def _anchor_re(cls: str) -> "re.Pattern":
+    return re.compile(
+        r"<a\b(?=[^>]*" + _class_test(cls) + r")"
+        r"""[^>]*(?<![\w-])href\s*=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<uq>[^\s"'=<>`]+))"""
+        r"[^>]*>(?P<inner>.*?)</a>",
+        re.S | re.I,
+    )
+
+def _count_re(cls: str) -> "re.Pattern":
+    # looser than _anchor_re (may cross a quoted ">"): just counts the anchors
+    # carrying the class, so a partial regex parse can be spotted
+    return re.compile(r"<a\b[^<]*?" + _class_test(cls), re.I)
+
+def _title_re(cls: str) -> "re.Pattern":
+    return re.compile(
+        r"<(?P<tag>\w+)\b[^>]*" + _class_test(cls) + r"[^>]*>(?P<inner>.*?)</(?P=tag)>",
+        re.S | re.I,
+    )
+
+_RE_SERIES = _anchor_re("exampleSelectProductListItem")
+_RE_SERIES_COUNT = _count_re("exampleSelectProductListItem")
+_RE_SERIES_TITLE = _title_re("ItemTitle")
+_RE_PRODUCT = _anchor_re("ProductItem")
+_RE_PRODUCT_COUNT = _count_re("ProductItem")
+_RE_PRODUCT_TITLE = _title_re("ProductItemContent")
+_RE_TAG = re.compile(r"<[^>]+>")
+
+def _regex_links(html: str, link_re: "re.Pattern", count_re: "re.Pattern",
+                 title_re: "re.Pattern", title_xp: etree.XPath) -> List[Tuple[str, Optional[str]]]:
+    matches = list(link_re.finditer(html))
+    if len(matches) != sum(1 for _ in count_re.finditer(html)):
+        # some anchor didn't parse (quoted ">", missing </a>, ...): use the DOM
+        return []
+    out = []
+    for m in matches:
+        t = title_re.search(m.group("inner"))
+        if t is None:
+            title = None
+        elif re.search(r"<%s\b" % t.group("tag"), t.group("inner"), re.I):
+            # same tag nested inside the title: the lazy match may stop at the
+            # inner closing tag, so let lxml find where the title really ends
+            title = _dom_title(m.group(0), title_xp)
+        else:
+            title = unescape(_RE_TAG.sub("", t.group("inner")))
+        out.append((unescape(m.group("dq") or m.group("sq") or m.group("uq") or ""), title))
+    return out
 
-# ---------- REQUESTS HELPERS ----------
-def fetch(url: str) -> Optional[str]:
-    headers = {
+def _dom_title(anchor_html: str, title_xp: etree.XPath) -> Optional[str]:
+    try:
+        a = lxml.html.fragment_fromstring(anchor_html)
+    except (etree.ParserError, ValueError):
+        return None
+    ttl = _first(title_xp, a)
+    return ttl.text_content() if ttl is not None else None
+
+def _dom_links(html: str, link_xp: etree.XPath, title_xp: etree.XPath) -> List[Tuple[str, Optional[str]]]:
+    tree = _parse_html(html)
+    if tree is None:
+        return []
+    out = []
+    for a in link_xp(tree):
+        ttl = _first(title_xp, a)
+        out.append((a.get("href", ""), ttl.text_content() if ttl is not None else None))
+    return out
+
+# ---------- HTTP HELPERS ----------
+# one HTTP/2 client for the whole crawl: every worker thread multiplexes its
+# GETs over the same kept-alive TLS connection instead of a pool of HTTP/1.1 ones
+_CLIENT = httpx.Client(
+    http2=True,
+    headers={
         "User-Agent": ("Mozilla/5.0 (Macintosh; Intel Mac OS X) "
                        "AppleWebKit/537.36 (KHTML, like Gecko) "
                        "Chrome/123 Safari/537.36")
-    }
-    for _ in range(RETRIES):
+    },
+    timeout=TIMEOUT,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    follow_redirects=True,
+)
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_BACKOFF = 0.6
+
+_host_sems: Dict[str, threading.Semaphore] = {}
+_host_sems_lock = threading.Lock()
+
+def _host_sem(host: str) -> threading.Semaphore:
+    with _host_sems_lock:
+        sem = _host_sems.get(host)
+        if sem is None:
+            sem = _host_sems[host] = threading.Semaphore(MAX_PER_HOST)
+    return sem
+
+# adaptive politeness: no fixed sleeps, a host is only paused when it asks
+# (Retry-After / X-RateLimit-*) or when we back off after a 429/5xx
+_next_allowed: Dict[str, float] = {}  # host -> time.monotonic() to wait for
+_next_allowed_lock = threading.Lock()
+
+def _header_delay(headers: httpx.Headers) -> float:
+    """Seconds the server asked us to hold off for, or 0."""
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    if headers.get("X-RateLimit-Remaining") == "0":
         try:
-            r = requests.get(url, headers=headers, timeout=TIMEOUT)
+            reset = float(headers.get("X-RateLimit-Reset", ""))
+            # either an epoch timestamp or seconds from now
+            return max(0.0, reset - time.time() if reset > 1e9 else reset)
+        except ValueError:
+            pass
+    return 0.0
+
+def _hold_off(host: str, delay: float):
+    until = time.monotonic() + min(delay, MAX_HOLD_OFF)
+    with _next_allowed_lock:
+        _next_allowed[host] = max(_next_allowed.get(host, 0.0), until)
+
+def _wait_turn(host: str):
+    with _next_allowed_lock:
+        wait = _next_allowed.get(host, 0.0) - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+
+def fetch(url: str) -> Optional[str]:
+    host = urlparse(url).netloc
+    for attempt in range(RETRIES + 1):
+        _wait_turn(host)
+        try:
+            with _host_sem(host):
+                r = _CLIENT.get(url)
+            delay = _header_delay(r.headers)
             if r.status_code == 200:
+                if delay:
+                    _hold_off(host, delay)
                 return r.text
-            time.sleep(0.6)
-        except requests.RequestException:
-            time.sleep(0.6)
+            if r.status_code not in _RETRY_STATUSES:
+                break
+            _hold_off(host, max(delay, _BACKOFF * 2 ** attempt))
+        except httpx.HTTPError:
+            if attempt < RETRIES:
+                time.sleep(_BACKOFF * 2 ** attempt)
     print(f" Failed to load: {url}")
     return None
 
-def soup_from(url: str) -> Optional[BeautifulSoup]:
-    html = fetch(url)
-    if not html:
+# fetch() has already decoded the page; parsing our own utf-8 bytes keeps lxml
+# from rejecting str input with an <?xml encoding=...?> declaration, and the
+# explicit encoding stops that declaration from overriding ours
+# (lxml parser objects must not be shared between threads)
+_parsers = threading.local()
+
+def _parse_html(html: str) -> Optional[HtmlElement]:
+    parser = getattr(_parsers, "html", None)
+    if parser is None:
+        parser = _parsers.html = lxml.html.HTMLParser(encoding="utf-8")
+    try:
+        return lxml.html.document_fromstring(html.encode("utf-8"), parser=parser)
+    except (etree.ParserError, ValueError):
         return None
-    return BeautifulSoup(html, "html.parser")
+
+_WS = re.compile(r"\s+")
+_SLUG = re.compile(r"[^a-z0-9\s_\-\.x]")
+_TR = str.maketrans({"×": "x", "ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u"})
 
 def clean_text(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    return _WS.sub(" ", (s or "").strip())
 
 def absolutize(href: str, base: str = BASE) -> str:
     if not href:
@@ -53,13 +246,14 @@ def absolutize(href: str, base: str = BASE) -> str:
     return urljoin(base, href)
 
 def slugify(text: str) -> str:
-    t = (text or "").lower().replace("×", "x")
-    t = t.replace("ç","c").replace("ğ","g").replace("ı","i").replace("ö","o").replace("ş","s").replace("ü","u")
-    t = re.sub(r"[^a-z0-9\s_\-\.x]", "", t)
+    t = (text or "").lower().translate(_TR)
+    t = _SLUG.sub("", t)
     t = "_".join(t.split())
     return t
 
 # ---------- IMAGE URL UNWRAPPER ----------
+# pure function of src; gallery thumbnails/logos repeat a lot across products
+@functools.lru_cache(maxsize=8192)
 def _unwrap_proxied(src: str) -> str:
     if not src:
         return ""
@@ -76,15 +270,14 @@ def _unwrap_proxied(src: str) -> str:
         pass
     return src
 
-# ---------- SELENIUM (SHARED) ----------
-_tex_driver = None
-_tex_wait = None
+# ---------- SELENIUM (DRIVER POOL) ----------
+# each slot: {"driver", "wait", "profile", "cookies_accepted"}
+_DRIVER_POOL: "queue.Queue[Dict]" = queue.Queue()
+_drivers: List[Dict] = []
+_drivers_lock = threading.Lock()
 
-def _ensure_tex_driver():
-    """Create a single headless Selenium driver."""
-    global _tex_driver, _tex_wait
-    if _tex_driver is not None:
-        return
+def _new_tex_driver() -> Dict:
+    """Create one headless Selenium driver with its own profile."""
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
@@ -97,18 +290,94 @@ def _ensure_tex_driver():
     opts.add_argument("--disable-dev-shm-usage")
     opts.add_argument("--window-size=1600,1600")
     opts.add_argument("--lang=en-US")
+    # one profile per driver for the whole run: cookie consent and cache carry over between pages
+    profile = tempfile.mkdtemp(prefix="chrome-prof-")
+    opts.add_argument(f"--user-data-dir={profile}")
+    opts.add_argument("--blink-settings=imagesEnabled=false")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--disable-extensions")
+    opts.add_argument("--disable-background-networking")
+    # we only need DOM text and image URLs, not the pixels/styles
+    opts.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+    })
+    opts.page_load_strategy = "eager"
     service = Service(ChromeDriverManager().install())
     d = webdriver.Chrome(service=service, options=opts)
-    _tex_driver = d
-    _tex_wait = WebDriverWait(d, 15)
+    d.set_script_timeout(15)
+    return {"driver": d, "wait": WebDriverWait(d, 15), "profile": profile, "cookies_accepted": False}
 
-def _selenium_load_and_accept(url: str):
-    """Load a URL and accept cookies if present."""
+def _ensure_driver_pool():
+    """Start SELENIUM_DRIVERS drivers the first time a fallback needs one."""
+    with _drivers_lock:
+        if _drivers:
+            return
+        for _ in range(SELENIUM_DRIVERS):
+            slot = _new_tex_driver()
+            _drivers.append(slot)
+            _DRIVER_POOL.put(slot)
+
+@contextmanager
+def _checkout_driver():
+    """Borrow a driver from the pool, blocking until one is free."""
+    _ensure_driver_pool()
+    slot = _DRIVER_POOL.get()
+    try:
+        yield slot
+    finally:
+        _DRIVER_POOL.put(slot)
+
+def _quit_drivers():
+    with _drivers_lock:
+        for slot in _drivers:
+            try:
+                slot["driver"].quit()
+            except Exception:
+                pass
+            shutil.rmtree(slot["profile"], ignore_errors=True)
+        _drivers.clear()
+        # drop the dead drivers from the queue too, so a rebuilt pool starts clean
+        while True:
+            try:
+                _DRIVER_POOL.get_nowait()
+            except queue.Empty:
+                break
+
+def _render_in_place(slot: Dict, url: str, html: str) -> bool:
+    """
+    Swap the driver's current document for HTML we already fetched, so the
+    browser runs the page's JS without downloading it again. Only done when
+    the driver is already on the same origin, so relative assets, cookies
+    and the site's own XHRs keep working.
+    """
+    d = slot["driver"]
+    try:
+        here, there = urlparse(d.current_url), urlparse(url)
+        if (here.scheme, here.netloc) != (there.scheme, there.netloc):
+            return False
+        d.execute_script("history.replaceState(null, '', arguments[0]);", url)
+        frame_id = d.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]["id"]
+        d.execute_cdp_cmd("Page.setDocumentContent", {"frameId": frame_id, "html": html})
+        return True
+    except Exception:
+        return False
+
+def _selenium_load_and_accept(slot: Dict, url: str):
+    """Load a URL and accept cookies if present (only until accepted once)."""
     from selenium.webdriver.common.by import By
-    _ensure_tex_driver()
-    d = _tex_driver
+    from selenium.webdriver.support import expected_conditions as EC
+    d = slot["driver"]
     d.get(url)
-    time.sleep(0.8)
+    # wait for the product section instead of a fixed pause
+    try:
+        slot["wait"].until(EC.presence_of_element_located(
+            (By.CSS_SELECTOR, "section.ExampleSection")
+        ))
+    except Exception:
+        pass
+    if slot["cookies_accepted"]:
+        return d
     # accept cookies if present
     for sel in [
         "button#onetrust-accept-btn-handler",
@@ -119,25 +388,19 @@ def _selenium_load_and_accept(url: str):
             btns = d.find_elements(By.CSS_SELECTOR, sel)
             if btns and btns[0].is_displayed():
                 d.execute_script("arguments[0].click();", btns[0])
+                slot["cookies_accepted"] = True
                 time.sleep(0.2)
                 break
         except Exception:
             pass
     return d
 
-# ---------- TEXTURES (BS4 + SELENIUM) ----------
-def extract_textures_bs4(sp: BeautifulSoup) -> str:
+# ---------- TEXTURES (BS4) ----------
+def extract_textures_bs4(sp: HtmlElement) -> str:
     urls, seen = [], set()
-    sec = sp.select_one("section.ExampleSection")
-    if not sec:
-        return ""
-    container = sec.select_one("div.ExampleContainer")
-    if not container:
-        return ""
-    nodes = container.select("img.picture__image, source[srcset]")
-    for node in nodes:
+    for node in _XP_TEX(sp):
         src = (node.get("src") or node.get("data-src") or "").strip()
-        if not src and node.name == "source":
+        if not src and node.tag == "source":
             srcset = (node.get("srcset") or "").split(",")[0].strip()
             if srcset:
                 src = srcset.split()[0]
@@ -147,204 +410,215 @@ def extract_textures_bs4(sp: BeautifulSoup) -> str:
             urls.append(real)
     return " | ".join(urls)
 
-def extract_textures_selenium(product_url: str) -> str:
-    """Open product, open Texture accordion, force-load all slides, collect URLs."""
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support import expected_conditions as EC
-
-    try:
-        d = _selenium_load_and_accept(product_url)
-        wait = _tex_wait
-
-        # scroll near details/texture area
-        for y in (300, 900, 1400):
-            d.execute_script(f"window.scrollTo(0,{y});")
-            time.sleep(0.2)
-
-        # find texture section & click the head button if present
-        try:
-            sec = wait.until(EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "section.ExampleSection")
-            ))
-            try:
-                btn = sec.find_element(By.CSS_SELECTOR, ".texture-ExampleButton")
-                if btn.is_displayed():
-                    d.execute_script("arguments[0].click();", btn)
-                    time.sleep(0.3)
-            except Exception:
-                pass
-        except Exception:
-            return ""
-
-        # wait for the container
-        try:
-            wait.until(EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "div.ExampleContainer")
-            ))
-        except Exception:
-            return ""
-
-        # center & horizontally scroll container to trigger lazy loading
-        d.execute_script("""
-            const sec = document.querySelector('section.Section');
-            if (sec) sec.scrollIntoView({behavior:'instant', block:'center'});
-        """)
-        time.sleep(0.2)
-        d.execute_script("""
-            const c = document.querySelector('div.ExampleContainer');
-            if (c) {
-                const step = Math.max(400, Math.floor(c.scrollWidth / 6));
-                for (let x = 0; x <= c.scrollWidth + 50; x += step) {
-                    c.scrollTo(x, 0);
-                }
-            }
-        """)
-        time.sleep(0.4)
-
-        # collect image and source urls 
-        srcs = d.execute_script("""
-            const out = [];
-            const c = document.querySelector('div.exampleContainer");
-            if (!c) return out;
-            const nodes = c.querySelectorAll('img.picture__image, source[srcset]');
-            for (const node of nodes) {
-                let s = (node.getAttribute('src') || node.getAttribute('data-src') || '').trim();
-                if (!s && node.tagName.toLowerCase() === 'source') {
-                    const first = (node.getAttribute('srcset') || '').split(',')[0].trim().split(/\s+/)[0];
-                    if (first) s = first;
-                }
-                if (s) out.push(s);
-                if (node.tagName.toLowerCase() === 'img') {
-                    const cs = (node.currentSrc || '').trim();
-                    if (cs) out.push(cs);
-                }
-            }
-            return out;
-        """)
-
-        urls, seen = [], set()
-        for src in srcs:
-            real = _unwrap_proxied(src)
-            if real and real not in seen:
-                seen.add(real)
-                urls.append(real)
-        return " | ".join(urls)
-    except Exception:
-        return ""
-
-# ---------- DETAILS (BS4 + robust Selenium JS) ----------
-def extract_detail_block_bs4(sp: BeautifulSoup, titles_en_it: List[str], mod: Optional[str]) -> Optional[BeautifulSoup]:
+# ---------- DETAILS (BS4) ----------
+def extract_detail_block_bs4(sp: HtmlElement, titles_en_it: List[str], mod: Optional[str]) -> Optional[HtmlElement]:
     # by modifier
     if mod:
-        node = sp.select_one(f".exampleProductDetails")
-        if node:
+        node = _first(_XP_DETAILS, sp)
+        if node is not None:
             return node
     # by title text
-    for itm in sp.select(".exampleProductDetailsItem"):
-        h = itm.select_one("h4 .title__content")
-        if not h:
+    for itm in _XP_DETAILS_ITEM(sp):
+        h = _first(_XP_ITEM_TITLE, itm)
+        if h is None:
             continue
-        title = clean_text(h.get_text()).lower()
+        title = clean_text(h.text_content()).lower()
         if title in [t.lower() for t in titles_en_it]:
             return itm
     return None
 
-def extract_list_items_text(block: BeautifulSoup) -> List[str]:
+def extract_list_items_text(block: Optional[HtmlElement]) -> List[str]:
     out = []
-    if not block:
+    if block is None:
         return out
-    for li in block.select(".details__item__list li"):
-        txt = clean_text(li.get_text())
+    for li in _XP_LIST_LI(block):
+        txt = clean_text(li.text_content())
         if txt:
             out.append(txt)
     return out
 
-def extract_details_bs4(sp: BeautifulSoup) -> Dict[str, List[str]]:
+def extract_details_bs4(sp: HtmlElement) -> Dict[str, List[str]]:
     formats_block = extract_detail_block_bs4(sp, ["Formats", "Formati", "Formato"], "formati")
     finishing_block = extract_detail_block_bs4(sp, ["Finishing", "Finiture", "Finitura"], "finiture")
     thickness_block = extract_detail_block_bs4(sp, ["Thickness", "Spessori", "Spessore"], "spessori")
     characteristics_block = extract_detail_block_bs4(sp, ["Characteristics", "Caratteristiche"], "caratteristiche")
 
+    characteristics_text = ""
+    if characteristics_block is not None:
+        # one whitespace pass per paragraph, no throwaway list
+        parts = (_WS.sub(" ", (p.text_content() or "").strip()) for p in _XP_PARAS(characteristics_block))
+        characteristics_text = " ".join(t for t in parts if t)
+
     return {
         "Formats": extract_list_items_text(formats_block),
         "Finishing": extract_list_items_text(finishing_block),
         "Thickness": extract_list_items_text(thickness_block),
-        "Characteristics_text": " ".join([
-            clean_text(p.get_text()) for p in (characteristics_block.select(".paragraph, p") if characteristics_block else [])
-            if clean_text(p.get_text())
-        ]) if characteristics_block else ""
+        "Characteristics_text": characteristics_text,
     }
 
-def extract_details_selenium(product_url: str) -> Dict[str, List[str]]:
-    """
-    Uses JS in the page to iterate each .details__item, read its title/modifier,
-    and collect <li> texts + paragraphs for Characteristics.
-    """
-    from selenium.webdriver.support import expected_conditions as EC
-    from selenium.webdriver.common.by import By
+# ---------- SELENIUM FALLBACK (DETAILS + TEXTURES, ONE VISIT) ----------
+# Runs in the page as one async script and resolves to [details, texture_srcs].
+# arguments[0] is the per-wait budget (ms): a full one after a real
+# navigation, a short one for the in-place render, which is already parsed
+_SELENIUM_JS = """
+    const done = arguments[arguments.length - 1];
+    const budget = arguments.length > 1 ? arguments[0] : 6000;
+    const pause = ms => new Promise(r => setTimeout(r, ms));
+    const waitFor = async (sel, ms) => {
+        for (let t = 0; t < ms; t += 100) {
+            const el = document.querySelector(sel);
+            if (el) return el;
+            await pause(100);
+        }
+        return document.querySelector(sel);
+    };
+
+    // iterate each .details__item, read its title/modifier, and collect
+    // <li> texts + paragraphs for Characteristics
+    const details = async () => {
+        const res = {name:"", formats:[], finishing:[], thickness:[], characteristics_text:""};
+        const found = await waitFor('.exampleProductDetails', budget);
+        // read after the wait so a late-mounting hero is named too; same
+        // lookup as the static path, so both paths name a product alike
+        const nameNode = document.querySelector('.exampleProductItemContent')
+                      || document.querySelector('h1 .title__content');
+        res.name = (nameNode?.textContent || "").trim();
+        if (!found) return res;
+
+        // small scroll nudges can trigger late mounts
+        for (const y of [300, 800, 1200]) {
+            window.scrollTo(0, y);
+            await pause(50);
+        }
+
+        const root = document.querySelector('.product-hero__details');
+        if (!root) return res;
+        const blocks = root.querySelectorAll('.details__item');
+        const norm = s => (s||"").trim().toLowerCase();
+        for (const b of blocks) {
+            const title = norm(b.querySelector('h4 .title__content')?.textContent);
+            const cls = Array.from(b.classList).find(c => c.startsWith('details__item--')) || "";
+            const mod = norm(cls.replace('details__item--',''));
+            const items = Array.from(b.querySelectorAll('.details__item__list li'))
+                              .map(li => norm(li.textContent))
+                              .filter(Boolean);
+            const paras = Array.from(b.querySelectorAll('.paragraph, p'))
+                              .map(p => norm(p.textContent))
+                              .filter(Boolean)
+                              .join(' ');
+            const is = keys => keys.includes(title) || keys.includes(mod);
+            if (is(['formats','formati','formato'])) res.formats = items;
+            else if (is(['finishing','finiture','finitura'])) res.finishing = items;
+            else if (is(['thickness','spessori','spessore'])) res.thickness = items;
+            else if (is(['characteristics','caratteristiche'])) res.characteristics_text = paras;
+        }
+        return res;
+    };
+
+    // open the Texture accordion, force-load all slides, collect URLs
+    const textures = async () => {
+        // scroll near details/texture area
+        for (const y of [300, 900, 1400]) {
+            window.scrollTo(0, y);
+            await pause(50);
+        }
+        const sec = document.querySelector('section.ExampleSection');
+        if (!sec) return [];
+        const btn = sec.querySelector('.texture-ExampleButton');
+        if (btn && btn.offsetParent !== null) btn.click();
+
+        const c = await waitFor('div.ExampleContainer', budget);
+        if (!c) return [];
+
+        // center & horizontally scroll container to trigger lazy loading
+        sec.scrollIntoView({behavior:'instant', block:'center'});
+        const step = Math.max(400, Math.floor(c.scrollWidth / 6));
+        for (let x = 0; x <= c.scrollWidth + 50; x += step) {
+            c.scrollTo(x, 0);
+            await pause(50);
+        }
+
+        // collect image and source urls
+        const out = [];
+        const nodes = c.querySelectorAll('img.picture__image, source[srcset]');
+        for (const node of nodes) {
+            let s = (node.getAttribute('src') || node.getAttribute('data-src') || '').trim();
+            if (!s && node.tagName.toLowerCase() === 'source') {
+                const first = (node.getAttribute('srcset') || '').split(',')[0].trim().split(/\\s+/)[0];
+                if (first) s = first;
+            }
+            if (s) out.push(s);
+            if (node.tagName.toLowerCase() === 'img') {
+                const cs = (node.currentSrc || '').trim();
+                if (cs) out.push(cs);
+            }
+        }
+        return out;
+    };
+
+    (async () => [await details(), await textures()])().then(done, () => done([null, []]));
+"""
+
+_WAIT_NAV_MS = 6000      # JS waitFor budget after navigating
+_WAIT_IN_PLACE_MS = 1000  # ...and for the in-place render
+_SELENIUM_FIELDS = ("Formats", "Finishing", "Thickness", "Textures")
+
+def _selenium_result(data: Optional[Dict], srcs: Optional[List[str]]) -> Tuple[Dict[str, List[str]], str]:
+    # convert back to display form (keep original punctuation like 6,5)
+    data = data or {}
+    result = {
+        "Formats": [s.replace("  ", " ").strip() for s in data.get("formats", [])],
+        "Finishing": [s.replace("  ", " ").strip() for s in data.get("finishing", [])],
+        "Thickness": [s.replace("  ", " ").strip() for s in data.get("thickness", [])],
+        "Characteristics_text": (data.get("characteristics_text") or "").strip(),
+        "Product_name": clean_text(data.get("name") or ""),
+    }
 
-    result = {"Formats": [], "Finishing": [], "Thickness": [], "Characteristics_text": ""}
+    urls, seen = [], set()
+    for src in srcs or []:
+        real = _unwrap_proxied(src)
+        if real and real not in seen:
+            seen.add(real)
+            urls.append(real)
+    return result, " | ".join(urls)
 
+def extract_all_selenium(product_url: str, html: Optional[str] = None,
+                         missing: Tuple[str, ...] = _SELENIUM_FIELDS) -> Tuple[Dict[str, List[str]], str]:
+    """
+    Single Selenium visit for a product: returns the details dict (same shape
+    as extract_details_bs4, plus "Product_name") and the " | "-joined texture
+    URLs. When the page
+    HTML was already fetched it is rendered in place instead of navigating;
+    a real navigation is only made if that leaves any of the `missing`
+    fields (names from _SELENIUM_FIELDS) empty.
+    """
     try:
-        d = _selenium_load_and_accept(product_url)
-        wait = _tex_wait
-
-        # ensure details are rendered
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".exampleProductDetails")))
-        except Exception:
-            return result
-
-        # small scroll nudges can trigger late mounts
-        for y in (300, 800, 1200):
-            d.execute_script(f"window.scrollTo(0,{y});")
-            time.sleep(0.15)
-
-        data = d.execute_script("""
-            const res = {formats:[], finishing:[], thickness:[], characteristics_text:""};
-            const root = document.querySelector('.product-hero__details');
-            if (!root) return res;
-            const blocks = root.querySelectorAll('.details__item');
-            const norm = s => (s||"").trim().toLowerCase();
-            for (const b of blocks) {
-                const title = norm(b.querySelector('h4 .title__content')?.textContent);
-                const cls = Array.from(b.classList).find(c => c.startsWith('details__item--')) || "";
-                const mod = norm(cls.replace('details__item--',''));
-                const items = Array.from(b.querySelectorAll('.details__item__list li'))
-                                  .map(li => norm(li.textContent))
-                                  .filter(Boolean);
-                const paras = Array.from(b.querySelectorAll('.paragraph, p'))
-                                  .map(p => norm(p.textContent))
-                                  .filter(Boolean)
-                                  .join(' ');
-                const is = keys => keys.includes(title) || keys.includes(mod);
-                if (is(['formats','formati','formato'])) res.formats = items;
-                else if (is(['finishing','finiture','finitura'])) res.finishing = items;
-                else if (is(['thickness','spessori','spessore'])) res.thickness = items;
-                else if (is(['characteristics','caratteristiche'])) res.characteristics_text = paras;
-            }
-            return res;
-        """)
-
-        # convert back to display form (keep original punctuation like 6,5)
-        result["Formats"] = [s.replace("  ", " ").strip() for s in data.get("formats", [])]
-        result["Finishing"] = [s.replace("  ", " ").strip() for s in data.get("finishing", [])]
-        result["Thickness"] = [s.replace("  ", " ").strip() for s in data.get("thickness", [])]
-        result["Characteristics_text"] = (data.get("characteristics_text") or "").strip()
-        return result
+        with _checkout_driver() as slot:
+            if html and _render_in_place(slot, product_url, html):
+                try:
+                    result, textures = _selenium_result(*slot["driver"].execute_async_script(
+                        _SELENIUM_JS, _WAIT_IN_PLACE_MS))
+                    filled = dict(result, Textures=textures)
+                    if all(filled[f] for f in missing):
+                        return result, textures
+                except Exception:
+                    pass
+            d = _selenium_load_and_accept(slot, product_url)
+            return _selenium_result(*d.execute_async_script(_SELENIUM_JS, _WAIT_NAV_MS))
     except Exception:
-        return result
+        return _selenium_result(None, None)
 
 # ---------- SCRAPER FLOW ----------
 def extract_series_from_list() -> List[Tuple[str, str]]:
-    sp = soup_from(LIST_URL)
-    if not sp:
+    html = fetch(LIST_URL)
+    if not html:
         return []
+    links = (_regex_links(html, _RE_SERIES, _RE_SERIES_COUNT, _RE_SERIES_TITLE, _XP_SERIES_TITLE)
+             or _dom_links(html, _XP_SERIES_LINK, _XP_SERIES_TITLE))
     series, seen = [], set()
-    for a in sp.select("a.exampleSelectProductListItem"):
-        href = absolutize(a.get("href", ""))
-        ttl = a.select_one(".ItemTitle")
-        name = clean_text(ttl.get_text()) if ttl else href.rstrip("/").split("/")[-1]
+    for raw_href, title in links:
+        href = absolutize(raw_href)
+        name = clean_text(title) if title is not None else href.rstrip("/").split("/")[-1]
         key = (name.lower(), href)
         if key in seen:
             continue
@@ -356,14 +630,15 @@ def extract_series_from_list() -> List[Tuple[str, str]]:
     return series
 
 def extract_product_cards(series_url: str) -> List[Tuple[str, str]]:
-    sp = soup_from(series_url)
-    if not sp:
+    html = fetch(series_url)
+    if not html:
         return []
+    links = (_regex_links(html, _RE_PRODUCT, _RE_PRODUCT_COUNT, _RE_PRODUCT_TITLE, _XP_PRODUCT_TITLE)
+             or _dom_links(html, _XP_PRODUCT_LINK, _XP_PRODUCT_TITLE))
     prods, seen = [], set()
-    for a in sp.select("a.ProductItem"):
-        href = absolutize(a.get("href", ""))
-        ttl = a.select_one(".ProductItemContent")
-        name = clean_text(ttl.get_text()) if ttl else href.rstrip("/").split("/")[-2]
+    for raw_href, title in links:
+        href = absolutize(raw_href)
+        name = clean_text(title) if title is not None else href.rstrip("/").split("/")[-2]
         k = (name.lower(), href)
         if k in seen:
             continue
@@ -374,32 +649,55 @@ def extract_product_cards(series_url: str) -> List[Tuple[str, str]]:
         prods.append((name, href))
     return prods
 
+# ---------- JS-RENDERED SERIES DETECTION ----------
+_bs4_hits: Dict[str, int] = {}
+_bs4_misses: Dict[str, int] = {}
+_bs4_stats_lock = threading.Lock()
+
+def _record_bs4(series_name: str, hit: bool):
+    with _bs4_stats_lock:
+        stats = _bs4_hits if hit else _bs4_misses
+        stats[series_name] = stats.get(series_name, 0) + 1
+
+def _series_is_js_rendered(series_name: str) -> bool:
+    """True once BS4 keeps coming back empty for a series and never succeeded."""
+    with _bs4_stats_lock:
+        return (_bs4_misses.get(series_name, 0) >= BS4_MISS_THRESHOLD
+                and not _bs4_hits.get(series_name))
+
 def parse_product_page(series_name: str, product_url: str) -> Dict:
     # force English path
     if "/en/" not in product_url:
         parsed = urlparse(product_url)
         product_url = urljoin(BASE, "/en" + parsed.path)
 
-    sp = soup_from(product_url)
-    if not sp:
+    seri = clean_text(series_name)
+    if _series_is_js_rendered(seri):
+        return _parse_product_selenium(seri, product_url)
+
+    html = fetch(product_url)
+    sp = _parse_html(html) if html else None
+    if sp is None:
         return {}
 
     # Product name
-    name_node = sp.select_one(".exampleProductItemContent") or sp.select_one("h1 .title__content")
-    prod_name = clean_text(name_node.get_text()) if name_node else product_url.rstrip("/").split("/")[-2]
-    seri = clean_text(series_name)
-
-    urun_kodu = slugify(f"{seri} {prod_name}")
+    name_node = _first(_XP_PRODUCT_NAME, sp)
+    if name_node is None:
+        name_node = _first(_XP_H1_TITLE, sp)
+    prod_name = clean_text(name_node.text_content()) if name_node is not None else product_url.rstrip("/").split("/")[-2]
 
-    # ---- DETAILS: BS4 first, Selenium fallback if any important field missing
+    # ---- DETAILS + ÜRÜN GÖRSELLER: BS4 first, one Selenium visit if anything missing
     det_bs4 = extract_details_bs4(sp)
     olculer_list = det_bs4.get("Formats", [])
     yuzey_list = det_bs4.get("Finishing", [])
     kalinlik_list = det_bs4.get("Thickness", [])
     urun_aciklamasi = det_bs4.get("Characteristics_text", "")
+    urun_gorseller = extract_textures_bs4(sp)
 
-    if not (olculer_list and yuzey_list and kalinlik_list):
-        det_sel = extract_details_selenium(product_url)
+    missing = tuple(f for f, v in (("Formats", olculer_list), ("Finishing", yuzey_list),
+                                   ("Thickness", kalinlik_list), ("Textures", urun_gorseller)) if not v)
+    if missing:
+        det_sel, tex_sel = extract_all_selenium(product_url, html, missing)
         if not olculer_list and det_sel.get("Formats"):
             olculer_list = det_sel["Formats"]
         if not yuzey_list and det_sel.get("Finishing"):
@@ -408,12 +706,27 @@ def parse_product_page(series_name: str, product_url: str) -> Dict:
             kalinlik_list = det_sel["Thickness"]
         if not urun_aciklamasi and det_sel.get("Characteristics_text"):
             urun_aciklamasi = det_sel["Characteristics_text"]
-
-    # ---- ÜRÜN GÖRSELLER: BS4 then Selenium
-    urun_gorseller = extract_textures_bs4(sp)
-    if not urun_gorseller:
-        urun_gorseller = extract_textures_selenium(product_url)
-
+        if not urun_gorseller:
+            urun_gorseller = tex_sel
+
+    # a miss is a page where BS4 found no details at all (a gallery-less
+    # product is not a sign of JS rendering)
+    _record_bs4(seri, any(det_bs4.values()))
+    return _product_row(seri, prod_name, olculer_list, yuzey_list, kalinlik_list,
+                        urun_gorseller, urun_aciklamasi, product_url)
+
+def _parse_product_selenium(seri: str, product_url: str) -> Dict:
+    """JS-rendered series: skip the HTTP/BS4 round-trip entirely."""
+    det_sel, urun_gorseller = extract_all_selenium(product_url)
+    prod_name = det_sel.get("Product_name") or product_url.rstrip("/").split("/")[-2]
+    return _product_row(seri, prod_name, det_sel.get("Formats", []), det_sel.get("Finishing", []),
+                        det_sel.get("Thickness", []), urun_gorseller,
+                        det_sel.get("Characteristics_text", ""), product_url)
+
+def _product_row(seri: str, prod_name: str, olculer_list: List[str], yuzey_list: List[str],
+                 kalinlik_list: List[str], urun_gorseller: str, urun_aciklamasi: str,
+                 product_url: str) -> Dict:
+    urun_kodu = slugify(f"{seri} {prod_name}")
     return {
         "Seri": seri,
         "Ürün adı": prod_name,
@@ -435,48 +748,73 @@ def main():
             return
 
         print(f"Found {len(series)} series on list page.")
-        rows: List[Dict] = []
-        total = 0
 
-        for s_idx, (seri_name, seri_url) in enumerate(series, 1):
-            if ITEM_LIMIT is not None and total >= ITEM_LIMIT:
-                break
+        def cards(job):
+            s_idx, (seri_name, seri_url) = job
             print(f"[{s_idx}/{len(series)}] Series: {seri_name} -> {seri_url}")
             prods = extract_product_cards(seri_url)
-            if not prods:
+            return [(seri_name, pname, purl) for pname, purl in prods]
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            # map() keeps the series order when flattening
+            jobs = [j for prods in pool.map(cards, enumerate(series, 1)) for j in prods]
+
+        # drop duplicate products before paying for parse_product_page; the row
+        # is named from the product page, so one URL under two card names is one row
+        seen_keys, unique_jobs = set(), []
+        for seri_name, pname, purl in jobs:
+            key = (seri_name.lower(), purl)
+            if key in seen_keys:
                 continue
-            for p_idx, (pname, purl) in enumerate(prods, 1):
-                if ITEM_LIMIT is not None and total >= ITEM_LIMIT:
-                    break
-                print(f"   - Product {p_idx}: {pname}")
-                row = parse_product_page(seri_name, purl)
-                if row:
-                    rows.append(row)
-                    total += 1
-                time.sleep(SLEEP_BETWEEN_PRODUCTS)
-            time.sleep(SLEEP_BETWEEN_SERIES)
-
-        if not rows:
-            print("No products collected.")
-            return
-
-        df = pd.DataFrame(rows)
-        df.drop_duplicates(subset=["Seri", "Ürün adı", "Ürün Linki"], inplace=True)
+            seen_keys.add(key)
+            unique_jobs.append((seri_name, pname, purl))
+        jobs = unique_jobs
 
+        # rows are streamed to disk (constant_memory flushes each row) and at most
+        # a window of products is in flight, so finished pages don't pile up in memory
         cols = ["Seri", "Ürün adı", "Ürün Kodu", "Ölçüler", "Yüzey", "Kalınlık",
                 "Ürün Görseller", "Ürün Açıklaması", "Ürün Linki"]
-        df = df[[c for c in cols if c in df.columns]]
+        wb = ws = None
+        n_rows = 0
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            todo = iter(enumerate(jobs, 1))
+            window = deque()
+            while True:
+                for p_idx, (seri_name, pname, purl) in itertools.islice(todo, IN_FLIGHT - len(window)):
+                    window.append((p_idx, pname, pool.submit(parse_product_page, seri_name, purl)))
+                if not window:
+                    break
+                # write rows in listing order: wait on the oldest product first
+                p_idx, pname, fut = window.popleft()
+                row = fut.result()
+                print(f"   - Product {p_idx}/{len(jobs)}: {pname}")
+                if not row:
+                    continue
+                if ws is None:
+                    # plain text cells: no auto hyperlinks/formulas for the URL lists
+                    wb = xlsxwriter.Workbook(OUT_XLSX, {"constant_memory": True,
+                                                        "strings_to_urls": False,
+                                                        "strings_to_formulas": False})
+                    ws = wb.add_worksheet()
+                    ws.write_row(0, 0, cols)
+                n_rows += 1
+                ws.write_row(n_rows, 0, [row[c] for c in cols])
+                if ITEM_LIMIT is not None and n_rows >= ITEM_LIMIT:
+                    # ITEM_LIMIT counts written rows, not attempted products
+                    for *_, pending in window:
+                        pending.cancel()
+                    break
+
+        if not n_rows:
+            print("No products collected.")
+            return
 
-        df.to_excel(OUT_XLSX, index=False)
-        print(f"Saved {len(df)} rows → {OUT_XLSX}")
+        wb.close()
+        print(f"Saved {n_rows} rows → {OUT_XLSX}")
     finally:
-        global _tex_driver
-        try:
-            if _tex_driver is not None:
-                _tex_driver.quit()
-        except Exception:
-            pass
-        _tex_driver = None
+        _CLIENT.close()
+        _quit_drivers()
 
 if __name__ == "__main__":
     main()